@@ -79,6 +79,27 @@ def convert(ctx):
     default=True,
     show_default=True,
 )
+@click.option(
+    "--backend",
+    help="Library used to compute spectrograms",
+    type=click.Choice(["librosa", "nnaudio"]),
+    default=settings.SPECTROGRAM_BACKEND,
+    show_default=True,
+)
+@click.option(
+    "--dtype",
+    help="Type to store spectrogram chunks as (uint8 and float16 are lossy)",
+    type=click.Choice(["float32", "float16", "uint8"]),
+    default=settings.CHUNK_DTYPE,
+    show_default=True,
+)
+@click.option(
+    "--archive",
+    help="Archive format for spectrogram chunks (tar.zst requires zstandard)",
+    type=click.Choice(["npz", "tar.zst"]),
+    default=settings.ARCHIVE_FORMAT,
+    show_default=True,
+)
 @click.option(
     "--skip",
     help="Number of samples to skip. Useful when restarting a failed job.",
@@ -141,6 +162,13 @@ def to_numpy(path, output, **kwargs):
     default=settings.IMAGE_FLIP,
     show_default=True,
 )
+@click.option(
+    "--backend",
+    help="Library used to compute spectrograms",
+    type=click.Choice(["librosa", "nnaudio"]),
+    default=settings.SPECTROGRAM_BACKEND,
+    show_default=True,
+)
 @click.option(
     "--skip",
     help="Number of data samples to skip. Useful when restarting a failed job.",
@@ -193,6 +221,13 @@ def to_image(path, output, **kwargs):
     default=settings.IMAGE_FLIP,
     show_default=True,
 )
+@click.option(
+    "--backend",
+    help="Library used to reconstruct audio",
+    type=click.Choice(["librosa", "torchaudio"]),
+    default=settings.GRIFFINLIM_BACKEND,
+    show_default=True,
+)
 @click.option(
     "--skip",
     help="Number of samples to skip. Useful when restarting a failed job.",
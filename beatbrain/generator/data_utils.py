@@ -7,7 +7,7 @@ import numpy as np
 import tensorflow as tf
 from PIL import Image
 
-from .. import settings
+from .. import settings, utils
 
 
 # region Pre-processing Functions
@@ -73,9 +73,7 @@ def split_spec_to_chunks(spec, chunk_size, window_size):
 
 
 def load_numpy(path):
-    with np.load(path.numpy(), allow_pickle=True) as npz:
-        arrays = list(npz.values())
-        return np.array(arrays)
+    return np.asarray(utils.load_arrays(path.numpy().decode()))
 
 
 def make_windows(array, window_size):
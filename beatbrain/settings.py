@@ -27,11 +27,20 @@ MODEL_WEIGHTS = os.path.join(ROOT_DIR, "models", "cvae_pendulum_keras.h5")
 NUM_CPUS = int(round(os.cpu_count() * 0.75))  # Use a portion of available CPUs
 SAMPLE_RATE = 32768  # Audio files are resampled to this many samples per second
 RESAMPLE_TYPE = "kaiser_fast"  # Resampling algorithm used by Librosa
+RESAMPLE_QUALITY = "HQ"  # Resampling quality used by soxr
 N_FFT = 4096  # STFT window size (in samples)
 HOP_LENGTH = 256  # STFT stride length (in samples)
 N_MELS = 512  # Number of frequency bins per frame (timestep)
 TOP_DB = 80
+ARCHIVE_FORMAT = "npz"  # Format of saved arrays ("npz" or "tar.zst")
+COMPRESSION_LEVEL = 1  # DEFLATE level used when saving arrays
+ZSTD_LEVEL = 3  # zstd level used when saving arrays as tar.zst
 AUDIO_FORMAT = "wav"
+SPECTROGRAM_BACKEND = "librosa"  # "librosa" (CPU) or "nnaudio" (GPU, requires PyTorch)
+GRIFFINLIM_BACKEND = "librosa"  # "librosa" (CPU) or "torchaudio" (GPU)
+GPU_DEVICE = "cuda"  # PyTorch device used by GPU backends
+GPU_BATCH_SIZE = 16  # Number of audio files converted per GPU batch
+IO_WORKERS = 2  # Threads used to read and write files alongside GPU conversion
 
 # Default Hyperparameters
 TEST_FRACTION = 0.2
@@ -53,5 +62,7 @@ DATA_PARALLEL = True  # Parallelize data pre-processing (can be resource-intensi
 AUDIO_OFFSET = 0.0
 AUDIO_DURATION = None
 CHUNK_SIZE = 640  # Number of frames per spectrogram chunk
+CHUNK_DTYPE = "float32"  # Storage type of saved spectrogram arrays ("float32", "float16" or "uint8")
 TRUNCATE = True
 IMAGE_FLIP = True
+IMAGE_FORMAT = "tiff"  # Format of saved spectrogram images ("tiff" or "exr")
@@ -0,0 +1,198 @@
+import numpy as np
+import librosa
+import pytest
+
+from beatbrain import utils
+
+
+@pytest.fixture
+def audio():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-1, 1, 22050).astype(np.float32)
+
+
+@pytest.mark.parametrize(
+    "n_fft, hop_length, n_mels", [(2048, 512, 128), (1024, 256, 64)]
+)
+def test_audio_to_spectrogram_matches_librosa(audio, n_fft, hop_length, n_mels):
+    kwargs = dict(sr=22050, n_fft=n_fft, hop_length=hop_length, n_mels=n_mels)
+    spec = utils.audio_to_spectrogram(audio, **kwargs)
+    expected = librosa.feature.melspectrogram(y=audio, pad_mode="constant", **kwargs)
+    assert spec.shape == expected.shape
+    np.testing.assert_allclose(spec, expected, rtol=1e-4, atol=1e-6 * expected.max())
+
+
+def test_audio_to_spectrogram_in_blocks(audio, monkeypatch):
+    kwargs = dict(sr=22050, n_fft=1024, hop_length=256, n_mels=64)
+    expected = utils.audio_to_spectrogram(audio, **kwargs)
+    monkeypatch.setattr(utils, "_STFT_BLOCK_BYTES", 7 * 513 * 8)  # 7 frames per block
+    np.testing.assert_allclose(
+        utils.audio_to_spectrogram(audio, **kwargs), expected, rtol=1e-6
+    )
+
+
+def test_audio_to_spectrogram_passes_extra_kwargs_to_librosa(audio):
+    kwargs = dict(sr=22050, n_fft=1024, hop_length=256, n_mels=64, fmax=8000, power=1)
+    spec = utils.audio_to_spectrogram(audio, **kwargs)
+    expected = librosa.feature.melspectrogram(y=audio, pad_mode="constant", **kwargs)
+    np.testing.assert_allclose(spec, expected, rtol=1e-5)
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(0)
+    return rng.random((5, 16, 8), dtype=np.float32)
+
+
+def check_arrays(path, expected, atol=0):
+    loaded = utils.load_arrays(path)
+    assert len(loaded) == len(expected)
+    for chunk, expected_chunk in zip(loaded, expected):
+        assert chunk.dtype == np.float32
+        np.testing.assert_allclose(chunk, expected_chunk, atol=atol)
+    for chunk, expected_chunk in zip(utils.iter_arrays(path), expected):
+        np.testing.assert_allclose(chunk, expected_chunk, atol=atol)
+    joined = utils.load_arrays(path, join=True)
+    np.testing.assert_allclose(joined, np.concatenate(expected, axis=-1), atol=atol)
+
+
+def test_load_legacy_npz(tmp_path, chunks):
+    path = tmp_path / "legacy.npz"
+    np.savez_compressed(path, *chunks)
+    check_arrays(path, list(chunks))
+
+
+@pytest.mark.parametrize("archive", ["npz", "tar.zst"])
+@pytest.mark.parametrize(
+    "dtype, atol", [("float32", 0), ("float16", 1e-3), ("uint8", 1 / 255)]
+)
+def test_save_arrays_stacked_round_trip(tmp_path, chunks, archive, dtype, atol):
+    if archive == "tar.zst":
+        pytest.importorskip("zstandard")
+    utils.save_arrays(chunks, tmp_path / "out", dtype=dtype, archive=archive)
+    path = tmp_path / f"out.{archive}"
+    assert isinstance(utils.load_arrays(path), np.ndarray)
+    check_arrays(path, list(chunks), atol=atol)
+
+
+@pytest.mark.parametrize("archive", ["npz", "tar.zst"])
+def test_save_arrays_ragged_round_trip(tmp_path, chunks, archive):
+    if archive == "tar.zst":
+        pytest.importorskip("zstandard")
+    ragged = [chunks[0], chunks[1][:, :4]]
+    utils.save_arrays(ragged, tmp_path / "out", archive=archive)
+    path = tmp_path / f"out.{archive}"
+    assert isinstance(utils.load_arrays(path), list)
+    check_arrays(path, ragged)
+
+
+@pytest.fixture
+def power_spectrogram():
+    rng = np.random.default_rng(0)
+    spec = rng.random((64, 200), dtype=np.float32) ** 8 * 100
+    spec[:, :10] = 0  # Silence, clipped to -top_db
+    return spec
+
+
+@pytest.mark.parametrize("top_db", [80, 40])
+def test_normalize_spectrogram_matches_librosa(power_spectrogram, top_db):
+    original = power_spectrogram.copy()
+    spec = utils.normalize_spectrogram(power_spectrogram, top_db=top_db)
+    expected = librosa.power_to_db(original, ref=np.max, top_db=top_db) / top_db + 1
+    np.testing.assert_array_equal(power_spectrogram, original)
+    assert spec.dtype == np.float32
+    np.testing.assert_allclose(spec, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("length, truncate", [(200, True), (200, False), (20, True)])
+def test_normalize_chunks_matches_normalize_then_split(
+    power_spectrogram, length, truncate
+):
+    spec = power_spectrogram[:, :length]
+    expected = utils.split_spectrogram(
+        utils.normalize_spectrogram(spec), 32, truncate=truncate
+    )
+    chunks = utils.split_spectrogram(spec, 32, truncate=truncate)
+    np.testing.assert_allclose(
+        utils.normalize_chunks(chunks, ref=spec.max()), expected, rtol=1e-6, atol=1e-6
+    )
+
+
+def split_with_np_split(spec, chunk_size, truncate, axis):
+    length = spec.shape[axis]
+    if length < chunk_size:
+        return [spec]
+    n_chunks, remainder = divmod(length, chunk_size)
+    if remainder and truncate:
+        spec = np.take(spec, range(n_chunks * chunk_size), axis=axis)
+    elif remainder:
+        padding = [(0, 0)] * spec.ndim
+        padding[axis] = (0, chunk_size - remainder)
+        spec = np.pad(spec, padding, mode="constant")
+        n_chunks += 1
+    return np.split(spec, n_chunks, axis=axis)
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("truncate", [True, False])
+@pytest.mark.parametrize("length", [96, 100, 20], ids=["exact", "remainder", "short"])
+def test_split_spectrogram_matches_np_split(length, truncate, axis):
+    rng = np.random.default_rng(0)
+    shape = (length, 16) if axis == 0 else (16, length)
+    spec = rng.random(shape, dtype=np.float32)
+    chunks = utils.split_spectrogram(spec, 32, truncate=truncate, axis=axis)
+    expected = split_with_np_split(spec, 32, truncate, axis)
+    assert isinstance(chunks, np.ndarray)
+    assert len(chunks) == len(expected)
+    np.testing.assert_array_equal(chunks, np.stack(expected))
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+def test_walk_files_skips_hidden_files(tmp_path):
+    audio = touch(tmp_path / "sub" / "a.wav")
+    touch(tmp_path / ".hidden.wav")
+    touch(tmp_path / ".cache" / "b.wav")
+    touch(tmp_path / "sub" / ".DS_Store")
+    assert list(utils._walk_files(tmp_path)) == [str(audio)]
+
+
+def test_walk_files_follows_symlinked_files(tmp_path):
+    real = touch(tmp_path / "real" / "a.wav")
+    (tmp_path / "links").mkdir()
+    link = tmp_path / "links" / "link.wav"
+    link.symlink_to(real)
+    (tmp_path / "links" / "dir").symlink_to(tmp_path / "real", target_is_directory=True)
+    assert list(utils._walk_files(tmp_path / "links")) == [str(link)]
+
+
+def test_get_data_type_returns_scanned_paths(tmp_path):
+    files = {str(touch(tmp_path / name)) for name in ["a.wav", "b.WAV", "sub/c.flac"]}
+    dtype, paths = utils.get_data_type(tmp_path)
+    assert dtype == utils.DataType.AUDIO
+    assert set(paths) == files
+
+
+def test_get_data_type_short_circuits_when_ambiguous(tmp_path, monkeypatch):
+    scanned = []
+
+    def walk(root):
+        for name in ["a.wav", "b.npz", "c.wav", "d.tiff"]:
+            scanned.append(name)
+            yield str(tmp_path / name)
+
+    monkeypatch.setattr(utils, "_walk_files", walk)
+    assert utils.get_data_type(tmp_path) == (utils.DataType.AMBIGUOUS, None)
+    assert scanned == ["a.wav", "b.npz"]
+    with pytest.raises(ValueError):
+        utils.get_data_type(tmp_path, raise_exception=True)
+
+
+def test_get_data_type_unknown(tmp_path):
+    touch(tmp_path / "notes.txt")
+    touch(tmp_path / "x.zst")
+    assert utils.get_data_type(tmp_path) == (utils.DataType.UNKNOWN, None)
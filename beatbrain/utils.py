@@ -1,13 +1,27 @@
 import warnings
 
 warnings.simplefilter("ignore", UserWarning)
+import io
+import os
 import enum
+import multiprocessing
+import tarfile
+import zipfile
 import numpy as np
+import scipy.fft
+import scipy.signal
 import librosa
 import imageio
+import tifffile
 import soundfile as sf
+import soxr
 from pathlib import Path
+from functools import partial, lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threadpoolctl import threadpool_limits
 from natsort import natsorted
+from numba import njit, set_num_threads
 from colorama import Fore
 from tqdm import tqdm
 from audioread.exceptions import DecodeError
@@ -16,6 +30,11 @@ from . import settings
 
 imageio.plugins.freeimage.download()
 
+# Number of threads used by `scipy.fft`. Worker processes set this to 1 (see `_init_worker()`)
+_FFT_WORKERS = -1
+# Size of the STFT computed at once by `audio_to_spectrogram()`, in bytes (cf. `librosa.util.MAX_MEM_BLOCK`)
+_STFT_BLOCK_BYTES = 2 ** 22
+
 
 # region Data Types
 class DataType(enum.Enum):
@@ -35,9 +54,62 @@ EXTENSIONS = {
         "mp3",
         "ogg",
     ],  # TODO: Remove artificial limit on supported audio formats
-    DataType.NUMPY: ["npy", "npz"],
-    DataType.IMAGE: ["exr"],
+    DataType.NUMPY: ["npy", "npz", "tar.zst"],
+    DataType.IMAGE: ["tiff", "tif", "exr"],
 }
+_EXTENSION_TYPES = {ext: dtype for dtype, exts in EXTENSIONS.items() for ext in exts}
+# npz/tar.zst key under which `save_arrays()` stores chunks stacked into a single array
+_STACKED_KEY = "chunks"
+
+
+def _walk_files(root):
+    """
+    Recursively yield the paths (as strings) of the files under a directory.
+    Hidden files and directories are skipped. Uses `os.scandir()`, whose entries cache file types, to avoid a `stat` call per file.
+    Like `Path.rglob()`, symlinks to files are followed but symlinked directories are not recursed into.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+
+def _get_extension(path):
+    """
+    Get the lowercase extension of a path, without the leading dot. `.tar.zst` counts as a single extension.
+    """
+    path = str(path).lower()
+    if path.endswith(".tar.zst"):
+        return "tar.zst"
+    return os.path.splitext(path)[1][1:]
+
+
+def _find_data_types(path):
+    """
+    Return the data types of the files under `path` along with the files scanned,
+    stopping as soon as more than one data type is found.
+    """
+    files = []
+    if os.path.isfile(path):
+        files = [path]
+    elif os.path.isdir(path):
+        files = _walk_files(path)
+    found_types = set()
+    scanned = []
+    for f in files:
+        scanned.append(f)
+        dtype = _EXTENSION_TYPES.get(_get_extension(f))
+        if dtype is not None:
+            found_types.add(dtype)
+            if len(found_types) > 1:
+                break
+    return found_types, scanned
 
 
 def get_data_type(path, raise_exception=False):
@@ -50,23 +122,16 @@ def get_data_type(path, raise_exception=False):
 
     Returns:
         DataType: The type of data contained at the given path (Audio, Numpy, or Image)
+        list: The files found under the given path, which can be passed on to the
+              converters to avoid walking the path again. None if the data type isn't homogeneous.
 
     Raises:
         ValueError: If `raise_exception` is True, the number of matched data types is either 0 or >1.
     """
     print(f"Checking input type(s) in {Fore.YELLOW}'{path}'{Fore.RESET}...")
-    found_types = set()
     path = Path(path)
-    files = []
-    if path.is_file():
-        files = [path]
-    elif path.is_dir():
-        files = filter(Path.is_file, path.rglob("*"))
-    for f in files:
-        for dtype, exts in EXTENSIONS.items():
-            suffix = f.suffix[1:]
-            if suffix in exts:
-                found_types.add(dtype)
+    paths = None
+    found_types, files = _find_data_types(str(path))
     if len(found_types) == 0:
         dtype = DataType.UNKNOWN
         if raise_exception:
@@ -75,6 +140,7 @@ def get_data_type(path, raise_exception=False):
             )
     elif len(found_types) == 1:
         dtype = found_types.pop()
+        paths = files
     else:
         dtype = DataType.AMBIGUOUS
         if raise_exception:
@@ -82,36 +148,59 @@ def get_data_type(path, raise_exception=False):
                 f"Ambiguous source data type. The following types were matched: {found_types}"
             )
     print(f"Determined input type to be {Fore.CYAN}'{dtype.name}'{Fore.RESET}")
-    return dtype
+    return dtype, paths
 
 
 # endregion
 
 # region Helper functions
-def get_paths(inp, parents=False, sort=True):
+def get_paths(inp, parents=False, sort=True, files=None):
     """
-    Recursively get the filenames under a given path
+    Recursively get the filenames (as strings) under a given path
 
     Args:
         inp (str): The path to search for files under
         parents (bool): If True, return the unique parent directories of the found files
+        files (list): The files under `inp`, if already known (e.g. from `get_data_type()`).
+                      Skips walking `inp` again.
     """
     inp = Path(inp)
     if not inp.exists():
         raise ValueError(f"Input must be a valid file or directory. Got '{inp}'")
     elif inp.is_dir():
-        paths = filter(Path.is_file, inp.rglob("*"))
+        paths = _walk_files(inp) if files is None else files
         if parents:
-            paths = {p.parent for p in paths}  # Unique parent directories
+            paths = {os.path.dirname(p) for p in paths}  # Unique parent directories
         paths = natsorted(paths) if sort else list(paths)
     else:
         paths = [inp]
     return paths
 
 
+@njit(cache=True)
+def _split_chunks(spec, n_chunks, chunk_size):
+    """
+    Copy the columns of a 2D array into `n_chunks` contiguous chunks in a single pass,
+    zero-padding the last chunk if `spec` runs out of columns.
+    """
+    n_rows, n_cols = spec.shape
+    chunks = np.empty((n_chunks, n_rows, chunk_size), dtype=spec.dtype)
+    for i in range(n_chunks):
+        start = i * chunk_size
+        width = min(chunk_size, n_cols - start)
+        for m in range(n_rows):
+            for k in range(width):
+                chunks[i, m, k] = spec[m, start + k]
+            for k in range(width, chunk_size):
+                chunks[i, m, k] = 0
+    return chunks
+
+
 def split_spectrogram(spec, chunk_size, truncate=True, axis=1):
     """
-    Split a numpy array along the chosen axis into fixed-length chunks
+    Split a numpy array along the chosen axis into fixed-length chunks.
+    The chunks are returned as a single array instead of a list of copies.
+    2D arrays split along their columns (the common case) are chunked by a compiled kernel.
 
     Args:
         spec (np.ndarray): The array to split along the chosen axis
@@ -121,18 +210,29 @@ def split_spectrogram(spec, chunk_size, truncate=True, axis=1):
                          Otherwise, the array is zero-padded to a multiple of `chunk_size`.
 
     Returns:
-        list: A list of arrays of equal size
+        np.ndarray: The chunks, stacked along a new leading axis
     """
-    if spec.shape[axis] >= chunk_size:
-        remainder = spec.shape[axis] % chunk_size
+    axis = axis % spec.ndim
+    if spec.ndim == 2 and axis == 1 and spec.shape[1] >= chunk_size:
+        n_chunks, remainder = divmod(spec.shape[1], chunk_size)
+        if remainder and not truncate:
+            n_chunks += 1
+        return _split_chunks(spec, n_chunks, chunk_size)
+    spec = np.moveaxis(spec, axis, -1)
+    if spec.shape[-1] >= chunk_size:
+        n_chunks, remainder = divmod(spec.shape[-1], chunk_size)
         if truncate:
-            spec = spec[:, :-remainder]
-        else:
-            spec = np.pad(spec, ((0, 0), (0, chunk_size - remainder)), mode="constant")
-        chunks = np.split(spec, spec.shape[axis] // chunk_size, axis=axis)
+            spec = spec[..., : n_chunks * chunk_size]
+        elif remainder:
+            padding = [(0, 0)] * (spec.ndim - 1) + [(0, chunk_size - remainder)]
+            spec = np.pad(spec, padding, mode="constant")
+            n_chunks += 1
+        spec = np.ascontiguousarray(spec)
+        chunks = spec.reshape(spec.shape[:-1] + (n_chunks, chunk_size))
+        chunks = np.moveaxis(chunks, -2, 0)
     else:
-        chunks = [spec]
-    return chunks
+        chunks = spec[np.newaxis]
+    return np.moveaxis(chunks, -1, axis + 1)
 
 
 def load_image(path, flip=True):
@@ -143,7 +243,10 @@ def load_image(path, flip=True):
         path: The file to load image from
         flip (bool): Whether to flip the image vertically
     """
-    spec = imageio.imread(path)
+    if Path(path).suffix[1:].lower() in ("tiff", "tif"):
+        spec = tifffile.imread(str(path))
+    else:
+        spec = imageio.imread(path)
     if flip:
         spec = spec[::-1]
     return spec
@@ -163,40 +266,333 @@ def load_images(path, flip=True, join=False):
     else:
         files = []
         for ext in EXTENSIONS[DataType.IMAGE]:
-            files.extend(path.glob(f"*.{ext}"))
+            files.extend(f for f in path.glob(f"*.{ext}") if not f.name.startswith("."))
         files = natsorted(files)
     chunks = [load_image(file, flip=flip) for file in files]
     return np.concatenate(chunks, axis=1) if join else chunks
 
 
+def _read_npy_header(f):
+    """
+    Read the header of a `.npy` stream, returning its (shape, fortran_order, dtype)
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    return np.lib.format.read_array_header_2_0(f)
+
+
+def _get_npz_shapes(npz, keys):
+    """
+    Read the shapes of arrays in an open npz file from their headers, without loading the arrays
+    """
+    shapes = []
+    for k in keys:
+        with npz.zip.open(f"{k}.npy") as f:
+            shape, _, _ = _read_npy_header(f)
+        shapes.append(shape)
+    return shapes
+
+
+def _join_npy_chunks(f):
+    """
+    Join a stacked (n, ..., chunk_size) `.npy` stream along its last axis.
+    Chunks are read one at a time into a preallocated output, so only the output and one chunk are held in memory.
+    """
+    shape, fortran_order, dtype = _read_npy_header(f)
+    if fortran_order:
+        chunks = np.frombuffer(f.read(), dtype=dtype).reshape(shape, order="F")
+        return np.concatenate(dequantize_spectrogram(chunks), axis=-1)
+    n_chunks, chunk_shape = shape[0], shape[1:]
+    width = chunk_shape[-1]
+    chunk_bytes = int(np.prod(chunk_shape)) * dtype.itemsize
+    spec = np.empty(chunk_shape[:-1] + (n_chunks * width,), dtype=np.float32)
+    for i in range(n_chunks):
+        chunk = np.frombuffer(f.read(chunk_bytes), dtype=dtype).reshape(chunk_shape)
+        spec[..., i * width : (i + 1) * width] = dequantize_spectrogram(chunk)
+    return spec
+
+
+@contextmanager
+def _open_zstd_tar(path):
+    """
+    Open a zstd-compressed tar (see `save_arrays()`) as a tar stream. Requires `zstandard`.
+    """
+    import zstandard
+
+    with open(path, "rb") as f, zstandard.ZstdDecompressor().stream_reader(
+        f
+    ) as reader, tarfile.open(fileobj=reader, mode="r|") as tar:
+        yield tar
+
+
+def _read_zstd_arrays(path):
+    """
+    Read the arrays in a zstd-compressed tar of `.npy` files (see `save_arrays()`) into a dict
+    """
+    arrays = {}
+    with _open_zstd_tar(path) as tar:
+        for member in tar:
+            key = os.path.splitext(member.name)[0]
+            data = io.BytesIO(tar.extractfile(member).read())
+            arrays[key] = np.lib.format.read_array(data, allow_pickle=False)
+    return arrays
+
+
 def load_arrays(path, join=False):
     """
-    Load a sequence of spectrogram arrays from a npy or npz file
+    Load a sequence of spectrogram arrays from a npy, npz or tar.zst file.
+    Quantized arrays are converted back to `float32` (see `dequantize_spectrogram()`).
+    Files written as a single stacked `chunks` array (see `save_arrays()`) are returned as one 3D array,
+    while files with one array per chunk are returned as a list.
+    With `join`, chunks are copied one at a time into a preallocated spectrogram, rather than loading them all first.
 
     Args:
         path: The file to load arrays from
+        join (bool): Whether to join the arrays into a single spectrogram along the last axis
     """
+    if str(path).endswith(".tar.zst"):
+        if join:
+            with _open_zstd_tar(path) as tar:
+                member = tar.next()
+                if member is not None and member.name == f"{_STACKED_KEY}.npy":
+                    return _join_npy_chunks(tar.extractfile(member))
+        arrays = _read_zstd_arrays(path)
+        if _STACKED_KEY in arrays:
+            return dequantize_spectrogram(arrays[_STACKED_KEY])
+        chunks = [dequantize_spectrogram(arrays.pop(k)) for k in natsorted(arrays)]
+        return np.concatenate(chunks, axis=-1) if join else chunks
     with np.load(path) as npz:
+        if _STACKED_KEY in npz.files:
+            if join:
+                with npz.zip.open(f"{_STACKED_KEY}.npy") as f:
+                    return _join_npy_chunks(f)
+            return dequantize_spectrogram(npz[_STACKED_KEY])
+        keys = natsorted(npz.keys())
+        if not join:
+            return [dequantize_spectrogram(npz[k]) for k in keys]
+        # Join into a preallocated array, so only one chunk is held in memory besides the output
+        shapes = _get_npz_shapes(npz, keys)
+        length = sum(shape[-1] for shape in shapes)
+        spec = np.empty(shapes[0][:-1] + (length,), dtype=np.float32)
+        offset = 0
+        for k, shape in zip(keys, shapes):
+            spec[..., offset : offset + shape[-1]] = dequantize_spectrogram(npz[k])
+            offset += shape[-1]
+        return spec
+
+
+def iter_arrays(path):
+    """
+    Iterate over the spectrogram arrays in a npz or tar.zst file, in the order `load_arrays()` returns them.
+    Arrays in npz files with one array per chunk are decoded one ahead on a background thread,
+    overlapping with the caller's work.
+
+    Args:
+        path: The file to load arrays from
+    """
+    if str(path).endswith(".tar.zst"):
+        yield from load_arrays(path)
+        return
+    with np.load(path) as npz, ThreadPoolExecutor(max_workers=1) as executor:
+        if _STACKED_KEY in npz.files:
+            yield from dequantize_spectrogram(npz[_STACKED_KEY])
+            return
         keys = natsorted(npz.keys())
-        chunks = [npz[k] for k in keys]
-        return np.concatenate(chunks, axis=1) if join else chunks
+        load = lambda k: dequantize_spectrogram(npz[k])
+        future = executor.submit(load, keys[0]) if keys else None
+        for i in range(len(keys)):
+            chunk = future.result()
+            if i + 1 < len(keys):
+                future = executor.submit(load, keys[i + 1])
+            yield chunk
 
 
-def audio_to_spectrogram(audio, normalize=False, norm_kwargs={}, **kwargs):
+def load_audio(
+    path,
+    sr=settings.SAMPLE_RATE,
+    offset=settings.AUDIO_OFFSET,
+    duration=settings.AUDIO_DURATION,
+    res_type=settings.RESAMPLE_TYPE,
+    quality=settings.RESAMPLE_QUALITY,
+):
     """
-    Convert an array of audio samples to a mel spectrogram
+    Load a mono audio signal resampled to the given sample rate.
+
+    Formats supported by libsndfile (wav, flac, ogg, ...) are read directly with `soundfile`,
+    decoding only the frames between `offset` and `offset + duration`, and resampled with `soxr`. Anything else falls back to `librosa.load()`.
+
+    Args:
+        path: The audio file to load
+        sr (int): The rate to resample the audio to
+        offset (float): Start reading after this time (in seconds)
+        duration (float): Only load up to this much audio (in seconds)
+        res_type (str): The resampling algorithm used by the `librosa` fallback
+        quality (str): The `soxr` resampling quality
+    """
+    try:
+        f = sf.SoundFile(str(path))
+    except RuntimeError:
+        audio, sr = librosa.load(
+            str(path), sr=sr, offset=offset, duration=duration, res_type=res_type
+        )
+        return audio
+    # Seek straight to the requested window and decode only its frames
+    with f:
+        sr_native = f.samplerate
+        f.seek(min(int(offset * sr_native), f.frames))
+        frames = -1 if duration is None else int(duration * sr_native)
+        audio = f.read(frames, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if sr_native != sr:
+        audio = soxr.resample(audio, sr_native, sr, quality=quality)
+    return audio
+
+
+@lru_cache(maxsize=8)
+def get_mel_basis(
+    sr=settings.SAMPLE_RATE, n_fft=settings.N_FFT, n_mels=settings.N_MELS
+):
+    """
+    Get a (cached, read-only) mel filter bank, as built by `librosa.filters.mel()`
+    """
+    mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+    mel_basis = mel_basis.astype(np.float32)
+    mel_basis.flags.writeable = False
+    return mel_basis
+
+
+@lru_cache(maxsize=8)
+def get_stft_window(n_fft=settings.N_FFT):
+    """
+    Get a (cached, read-only) periodic Hann window of length `n_fft`
+    """
+    window = scipy.signal.windows.hann(n_fft, sym=False).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+def audio_to_spectrogram(
+    audio,
+    sr=settings.SAMPLE_RATE,
+    n_fft=settings.N_FFT,
+    hop_length=settings.HOP_LENGTH,
+    n_mels=settings.N_MELS,
+    normalize=False,
+    norm_kwargs={},
+    **kwargs,
+):
+    """
+    Convert an array of audio samples to a mel spectrogram.
+    Equivalent to `librosa.feature.melspectrogram()` (centered frames, zero padding),
+    but reuses the mel filter bank and window across calls and runs a multi-threaded FFT.
 
     Args:
         audio (np.ndarray): The array of audio samples to convert
         normalize (bool): Whether to log and normalize the spectrogram to [0, 1] after conversion
         norm_kwargs (dict): Additional keyword arguments to pass to the spectrogram normalization function
+        **kwargs: Other `librosa.feature.melspectrogram()` options. If given, librosa computes the spectrogram
     """
-    spec = librosa.feature.melspectrogram(audio, **kwargs)
+    if kwargs:
+        spec = librosa.feature.melspectrogram(
+            y=audio,
+            sr=sr,
+            n_fft=n_fft,
+            hop_length=hop_length,
+            n_mels=n_mels,
+            **{"pad_mode": "constant", **kwargs},
+        )
+        if normalize:
+            spec = normalize_spectrogram(spec, **norm_kwargs)
+        return spec
+    audio = np.pad(audio.astype(np.float32, copy=False), n_fft // 2, mode="constant")
+    frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft)[::hop_length]
+    window = get_stft_window(n_fft)
+    mel_basis = get_mel_basis(sr, n_fft, n_mels)
+    spec = np.empty((n_mels, len(frames)), dtype=np.float32)
+    # Window, transform and project blocks of frames, so the full complex STFT is never held in memory
+    block = max(
+        1, _STFT_BLOCK_BYTES // ((n_fft // 2 + 1) * np.dtype(np.complex64).itemsize)
+    )
+    for start in range(0, len(frames), block):
+        stop = start + block
+        stft = scipy.fft.rfft(
+            frames[start:stop] * window, axis=-1, workers=_FFT_WORKERS
+        )
+        power = stft.real ** 2 + stft.imag ** 2
+        np.matmul(mel_basis, power.T, out=spec[:, start:stop])
     if normalize:
         spec = normalize_spectrogram(spec, **norm_kwargs)
     return spec
 
 
+def get_nnaudio_spectrogram(
+    sr=settings.SAMPLE_RATE,
+    n_fft=settings.N_FFT,
+    hop_length=settings.HOP_LENGTH,
+    n_mels=settings.N_MELS,
+    device=settings.GPU_DEVICE,
+):
+    """
+    Build an nnAudio mel spectrogram layer, which computes the STFT as a 1D convolution on the GPU.
+    Requires PyTorch and nnAudio to be installed.
+
+    Args:
+        device (str): The PyTorch device to place the layer on
+    """
+    from nnAudio.Spectrogram import MelSpectrogram
+
+    mel = MelSpectrogram(
+        sr=sr,
+        n_fft=n_fft,
+        hop_length=hop_length,
+        n_mels=n_mels,
+        pad_mode="constant",
+        verbose=False,
+    )
+    return mel.to(device)
+
+
+def audio_batch_to_spectrograms(
+    audios,
+    mel,
+    hop_length=settings.HOP_LENGTH,
+    normalize=False,
+    top_db=settings.TOP_DB,
+    device=settings.GPU_DEVICE,
+):
+    """
+    Convert a batch of audio sample arrays to mel spectrograms in a single GPU call
+
+    Args:
+        audios (list): Arrays of audio samples. These are zero-padded to a common length
+        mel: An nnAudio mel spectrogram layer (see `get_nnaudio_spectrogram()`)
+        hop_length (int): The hop length `mel` was built with
+        normalize (bool): Whether to log and normalize the spectrograms to [0, 1],
+                          equivalently to `normalize_spectrogram()`
+        top_db (float): The dynamic range (in dB) of the normalized spectrograms
+        device (str): The PyTorch device `mel` is placed on
+
+    Returns:
+        list: One mel spectrogram per input, trimmed to the length of that input
+    """
+    import torch
+
+    lengths = [len(audio) for audio in audios]
+    batch = torch.zeros((len(audios), max(lengths)), dtype=torch.float32, device=device)
+    for i, audio in enumerate(audios):
+        batch[i, : len(audio)] = torch.from_numpy(audio)
+    with torch.no_grad():
+        specs = mel(batch)
+        if normalize:
+            ref = specs.amax(dim=(-2, -1), keepdim=True).clamp(min=1e-10)
+            specs = 10 * torch.log10(specs.clamp(min=1e-10) / ref)
+            specs = specs.clamp(min=-top_db) / top_db + 1
+        specs = specs.cpu().numpy()
+    return [spec[:, : 1 + n // hop_length] for spec, n in zip(specs, lengths)]
+
+
 def spectrogram_to_audio(spec, denormalize=False, norm_kwargs={}, **kwargs):
     """
     Convert a mel spectrogram to audio
@@ -212,12 +608,110 @@ def spectrogram_to_audio(spec, denormalize=False, norm_kwargs={}, **kwargs):
     return audio
 
 
+@lru_cache(maxsize=8)
+def _get_inverse_mel_basis(sr, n_fft, n_mels, device):
+    import torch
+
+    mel_basis = torch.tensor(get_mel_basis(sr, n_fft, n_mels), device=device)
+    return torch.linalg.pinv(mel_basis)
+
+
+def spectrogram_to_audio_on_gpu(
+    spec,
+    sr=settings.SAMPLE_RATE,
+    n_fft=settings.N_FFT,
+    hop_length=settings.HOP_LENGTH,
+    n_iter=32,
+    denormalize=False,
+    norm_kwargs={},
+    device=settings.GPU_DEVICE,
+):
+    """
+    Convert a mel spectrogram to audio on the GPU using `torchaudio`'s Griffin-Lim implementation.
+    Unlike `spectrogram_to_audio()`, the mel filter bank is inverted with its pseudo-inverse
+    rather than by non-negative least squares. Requires PyTorch and torchaudio to be installed.
+
+    Args:
+        spec (np.ndarray): The mel spectrogram to convert to audio
+        n_iter (int): The number of Griffin-Lim iterations
+        denormalize (bool): Whether to exp and denormalize the spectrogram before conversion
+        norm_kwargs (dict): Additional keyword arguments to pass to the spectrogram denormalization function
+        device (str): The PyTorch device to run the conversion on
+    """
+    import torch
+    import torchaudio
+
+    if denormalize:
+        spec = denormalize_spectrogram(spec, **norm_kwargs)
+    inverse_mel_basis = _get_inverse_mel_basis(sr, n_fft, spec.shape[0], device)
+    with torch.no_grad():
+        spec = torch.from_numpy(np.ascontiguousarray(spec, dtype=np.float32))
+        magnitude = (inverse_mel_basis @ spec.to(device)).clamp(min=0).sqrt()
+        audio = torchaudio.functional.griffinlim(
+            magnitude,
+            window=torch.hann_window(n_fft, device=device),
+            n_fft=n_fft,
+            hop_length=hop_length,
+            win_length=n_fft,
+            power=1.0,
+            n_iter=n_iter,
+            momentum=0.99,
+            length=None,
+            rand_init=False,
+        )
+    return audio.cpu().numpy()
+
+
+def _normalize_db(spec, ref, top_db, amin):
+    """
+    In-place equivalent of `librosa.power_to_db(spec, ref=ref, top_db=top_db, amin=amin) / top_db + 1`,
+    where `ref` is the maximum power in `spec`. Every step writes back into `spec`, so no temporaries are allocated.
+    """
+    dtype = spec.dtype.type
+    np.maximum(spec, dtype(amin), out=spec)
+    np.log10(spec, out=spec)
+    spec *= dtype(10 / top_db)
+    spec += dtype(1 - 10 * np.log10(max(ref, amin)) / top_db)
+    np.maximum(spec, dtype(0), out=spec)
+    return spec
+
+
 # TODO: Remove dependency on settings.TOP_DB
-def normalize_spectrogram(spec, top_db=settings.TOP_DB, ref=np.max, **kwargs):
+def normalize_spectrogram(
+    spec, top_db=settings.TOP_DB, ref=np.max, amin=1e-10, **kwargs
+):
+    """
+    Log and normalize a mel spectrogram using `librosa.power_to_db()`.
+    The default case (`ref=np.max` on a floating point spectrogram) is computed in place on a single copy.
     """
-    Log and normalize a mel spectrogram using `librosa.power_to_db()`
+    floating = np.issubdtype(spec.dtype, np.floating)
+    if ref is np.max and floating and top_db is not None and not kwargs:
+        return _normalize_db(spec.copy(), float(spec.max()), float(top_db), float(amin))
+    db = librosa.power_to_db(spec, top_db=top_db, ref=ref, amin=amin, **kwargs)
+    return (db / top_db) + 1
+
+
+def normalize_chunks(chunks, ref=None, top_db=settings.TOP_DB, amin=1e-10, copy=True):
     """
-    return (librosa.power_to_db(spec, top_db=top_db, ref=ref, **kwargs) / top_db) + 1
+    Log and normalize a sequence of mel spectrogram chunks, as `normalize_spectrogram()` would.
+
+    Args:
+        chunks: The chunks to normalize (e.g. as returned by `split_spectrogram()`)
+        ref (float): The reference (maximum) power. Pass the maximum of the whole spectrogram to get
+                     the same result as normalizing it before splitting. Defaults to the maximum of `chunks`
+        top_db (float): The dynamic range (in dB) of the normalized chunks
+        copy (bool): If False, contiguous `float32` chunks are normalized in place
+
+    Returns:
+        np.ndarray: A contiguous `float32` array of shape (n_chunks, n_mels, chunk_size)
+    """
+    if copy:
+        tiles = np.array(chunks, dtype=np.float32, order="C")
+    else:
+        tiles = np.ascontiguousarray(chunks, dtype=np.float32)
+    if ref is None:
+        ref = tiles.max()
+    return _normalize_db(tiles, float(ref), float(top_db), float(amin))
 
 
 def denormalize_spectrogram(spec, top_db=settings.TOP_DB, ref=32768, **kwargs):
@@ -227,22 +721,120 @@ def denormalize_spectrogram(spec, top_db=settings.TOP_DB, ref=32768, **kwargs):
     return librosa.db_to_power((spec - 1) * top_db, ref=ref)
 
 
-def save_arrays(chunks, output, compress=True):
+def quantize_spectrogram(spec, dtype=settings.CHUNK_DTYPE):
+    """
+    Cast a normalized spectrogram to a (smaller) storage type.
+    Values are assumed to lie in [0, 1], and are scaled to [0, 255] for `uint8`.
+
+    Args:
+        spec (np.ndarray): The normalized spectrogram to quantize
+        dtype: One of `float32`, `float16` or `uint8`
+    """
+    dtype = np.dtype(dtype)
+    if dtype == np.uint8:
+        return np.round(np.clip(spec, 0, 1) * 255).astype(np.uint8)
+    return spec.astype(dtype, copy=False)
+
+
+def dequantize_spectrogram(spec):
+    """
+    Undo `quantize_spectrogram()`, returning a `float32` spectrogram in [0, 1]
+    """
+    if spec.dtype == np.uint8:
+        return spec.astype(np.float32) / 255
+    return spec.astype(np.float32, copy=False)
+
+
+def _to_npy_bytes(array, dtype):
+    buffer = io.BytesIO()
+    array = np.ascontiguousarray(quantize_spectrogram(array, dtype=dtype))
+    np.lib.format.write_array(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _stack_chunks(chunks):
+    """
+    Return `chunks` as a single (n, ..., chunk_size) array, or None if the chunks differ in shape
+    """
+    if isinstance(chunks, np.ndarray):
+        return chunks
+    if not chunks or any(chunk.shape != chunks[0].shape for chunk in chunks):
+        return None
+    return np.stack(chunks)
+
+
+def save_arrays(
+    chunks,
+    output,
+    compress=True,
+    compresslevel=settings.COMPRESSION_LEVEL,
+    dtype=settings.CHUNK_DTYPE,
+    archive=settings.ARCHIVE_FORMAT,
+):
     """
-    Save a sequence of arrays to a npy or npz file.
+    Save a sequence of arrays to a npz file, or to a zstd-compressed tar of `.npy` files.
+    Chunks of the same shape are stored as a single stacked array under the key `chunks`;
+    otherwise each array is stored under its own `arr_{k}` key.
+    Arrays are serialized in memory and written straight into the archive,
+    rather than going through a temporary file per array as `np.savez_compressed` does.
 
     Args:
         chunks (list): A sequence of arrays to save
-        output (str): The file to save the arrays to'
-        compress (bool): Whether to use `np.savez` to compress the output file
+        output (str): The file to save the arrays to. The archive extension is appended if missing
+        compress (bool): Whether to DEFLATE-compress the output file (npz only)
+        compresslevel (int): The DEFLATE compression level (1-9) to use if `compress` is True
+        dtype: The type to store the arrays as (see `quantize_spectrogram()`)
+        archive (str): The archive format, either `npz` or `tar.zst`
+    """
+    if archive not in ("npz", "tar.zst"):
+        raise ValueError(f"Unknown archive format '{archive}'")
+    output = str(output)
+    if not output.endswith(f".{archive}"):
+        output += f".{archive}"
+    if not isinstance(chunks, np.ndarray):
+        chunks = list(chunks)
+    stacked = _stack_chunks(chunks)
+    if stacked is not None:
+        members = [(f"{_STACKED_KEY}.npy", stacked)]
+    else:
+        members = [(f"arr_{k}.npy", chunk) for k, chunk in enumerate(chunks)]
+    if archive == "tar.zst":
+        return _save_zstd_arrays(members, output, dtype=dtype)
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(
+        output,
+        "w",
+        compression=compression,
+        compresslevel=compresslevel,
+        allowZip64=True,
+    ) as zf:
+        for name, array in members:
+            zf.writestr(name, _to_npy_bytes(array, dtype))
+
+
+def _save_zstd_arrays(
+    members, output, level=settings.ZSTD_LEVEL, dtype=settings.CHUNK_DTYPE
+):
+    """
+    Stream a sequence of (name, array) pairs into a zstd-compressed tar of `.npy` files. Requires `zstandard`.
     """
-    save = np.savez_compressed if compress else np.savez
-    save(str(output), *chunks)
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=level)
+    with open(output, "wb") as f, compressor.stream_writer(f) as writer, tarfile.open(
+        fileobj=writer, mode="w|"
+    ) as tar:
+        for name, array in members:
+            data = _to_npy_bytes(array, dtype)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
 
 
 def save_image(spec, output, flip=True):
     """
     Save an array as an image.
+    TIFF images are written directly with `tifffile`; other formats go through `imageio`.
 
     Args:
         spec (np.ndarray): A array to save as an image
@@ -252,20 +844,39 @@ def save_image(spec, output, flip=True):
     output = Path(output)
     if flip:
         spec = spec[::-1]
-    imageio.imwrite(output, spec, format="exr")
+    fmt = output.suffix[1:].lower()
+    if fmt in ("tiff", "tif"):
+        tifffile.imwrite(
+            str(output), spec.astype(np.float32, copy=False), photometric="minisblack"
+        )
+    else:
+        imageio.imwrite(output, spec, format=fmt)
 
 
-def save_images(chunks, output, flip=True):
+def save_images(chunks, output, flip=True, fmt=settings.IMAGE_FORMAT):
     """
     Save a sequence of arrays as images.
 
     Args:
-        chunks (list): A sequence of arrays to save as images
+        chunks (list): An iterable of arrays to save as images
         output (str): The directory to save the images to
         flip (bool): Whether to flip the images vertically
+        fmt (str): The image format to save as (`tiff` or `exr`)
     """
+    output = Path(output)
+    # Flip each chunk into one reused contiguous buffer, instead of allocating a copy per image
+    buffer = None
     for j, chunk in enumerate(chunks):
-        save_image(chunk, output.joinpath(f"{j}.exr"), flip=flip)
+        if buffer is None or buffer.shape != chunk.shape:
+            buffer = np.empty(chunk.shape, dtype=np.float32)
+        np.copyto(buffer, chunk[::-1] if flip else chunk)
+        save_image(buffer, output.joinpath(f"{j}.{fmt}"), flip=False)
+
+
+def _strip_extension(path):
+    if path.name.endswith(".tar.zst"):
+        return path.parent.joinpath(path.name[: -len(".tar.zst")])
+    return path.parent.joinpath(path.stem)
 
 
 # TODO: Consolidate these functions into one
@@ -274,7 +885,7 @@ def get_numpy_output_path(path, out_dir, inp):
     out_dir = Path(out_dir)
     inp = Path(inp)
     output = out_dir.joinpath(path.relative_to(inp))
-    output = output.parent.joinpath(output.stem)
+    output = _strip_extension(output)
     output.parent.mkdir(parents=True, exist_ok=True)
     return output
 
@@ -284,7 +895,7 @@ def get_image_output_path(path, out_dir, inp):
     out_dir = Path(out_dir)
     inp = Path(inp)
     output = out_dir.joinpath(path.relative_to(inp))
-    output = output.parent.joinpath(output.stem)
+    output = _strip_extension(output)
     output.mkdir(parents=True, exist_ok=True)
     return output
 
@@ -294,7 +905,7 @@ def get_audio_output_path(path, out_dir, inp, fmt):
     out_dir = Path(out_dir)
     inp = Path(inp)
     output = out_dir.joinpath(path.relative_to(inp))
-    output = output.parent.joinpath(output.name).with_suffix(f".{fmt}")
+    output = _strip_extension(output).with_suffix(f".{fmt}")
     output.parent.mkdir(parents=True, exist_ok=True)
     return output
 
@@ -302,6 +913,232 @@ def get_audio_output_path(path, out_dir, inp, fmt):
 # endregion
 
 # region Converters
+# CPU conversions run in a pool of worker processes that are started with forkserver or spawn (see `_get_mp_context()`).
+# Workers re-import the calling script's `__main__` module, so scripts that call the converters
+# must do so under an `if __name__ == "__main__":` guard. Otherwise the pool fails with `BrokenProcessPool`.
+def _init_worker(sr=None, n_fft=None, n_mels=None):
+    """
+    Limit each worker process to a single native thread, so that parallel conversions don't oversubscribe the CPU.
+    If spectrogram parameters are given, also build the worker's cached mel filter bank and STFT window up front,
+    so every task in the worker reuses them.
+    """
+    global _FFT_WORKERS
+    os.environ["OMP_NUM_THREADS"] = "1"
+    threadpool_limits(limits=1)
+    set_num_threads(1)
+    _FFT_WORKERS = 1
+    if sr is not None:
+        get_mel_basis(sr, n_fft, n_mels)
+        get_stft_window(n_fft)
+
+
+def _get_mp_context():
+    """
+    Get the multiprocessing context for worker pools.
+    Workers are never forked from the calling process, which may already be running Numba's threading layer
+    (forking it can leave the interpreter unable to exit). The forkserver preloads this module,
+    so each worker starts without re-importing it; platforms without forkserver use spawn.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _process_map(fn, paths, desc="Converting", initargs=()):
+    """
+    Apply a function to each of the given paths in a pool of worker processes.
+    Must be called under an `if __name__ == "__main__":` guard when run from a script.
+
+    Args:
+        fn: A picklable function that takes a single path
+        paths (list): The paths to process
+        desc (str): The progress bar description
+        initargs (tuple): Arguments for `_init_worker()`, e.g. `(sr, n_fft, n_mels)` to prewarm spectrogram caches
+    """
+    max_workers = max(1, min(settings.NUM_CPUS, len(paths)))
+    chunksize = max(1, len(paths) // (4 * max_workers))
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_get_mp_context(),
+        initializer=_init_worker,
+        initargs=initargs,
+    ) as executor:
+        results = executor.map(fn, paths, chunksize=chunksize)
+        for _ in tqdm(results, total=len(paths), desc=desc):
+            pass
+
+
+def _audio_to_chunks(
+    path,
+    sr,
+    offset,
+    duration,
+    res_type,
+    n_fft,
+    hop_length,
+    n_mels,
+    chunk_size,
+    truncate,
+):
+    """
+    Load an audio file and split its normalized mel spectrogram into chunks.
+    Returns None if the file could not be decoded.
+    """
+    try:
+        audio = load_audio(
+            path, sr=sr, offset=offset, duration=duration, res_type=res_type
+        )
+    except DecodeError as e:
+        print(f"Error decoding {path}: {e}")
+        return None
+    spec = audio_to_spectrogram(
+        audio, sr=sr, n_fft=n_fft, hop_length=hop_length, n_mels=n_mels
+    )
+    chunks = split_spectrogram(spec, chunk_size, truncate=truncate)
+    return normalize_chunks(chunks, ref=spec.max(), copy=False)
+
+
+def _load_audio_or_none(path, **kwargs):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    try:
+        return load_audio(path, **kwargs)
+    except DecodeError as e:
+        print(f"Error decoding {path}: {e}")
+        return None
+
+
+def _audio_to_chunks_on_gpu(
+    paths,
+    save,
+    sr,
+    offset,
+    duration,
+    res_type,
+    n_fft,
+    hop_length,
+    n_mels,
+    chunk_size,
+    truncate,
+    batch_size=settings.GPU_BATCH_SIZE,
+    io_workers=settings.IO_WORKERS,
+):
+    """
+    Convert audio files to spectrogram chunks in batches on the GPU using nnAudio,
+    calling `save(chunks, path)` for each successfully decoded file.
+
+    Decoding runs one batch ahead, and saving one batch behind, on background threads,
+    so that file I/O overlaps with the spectrogram computation.
+    """
+    mel = get_nnaudio_spectrogram(
+        sr=sr, n_fft=n_fft, hop_length=hop_length, n_mels=n_mels
+    )
+    load = partial(
+        _load_audio_or_none, sr=sr, offset=offset, duration=duration, res_type=res_type
+    )
+    batches = [paths[i : i + batch_size] for i in range(0, len(paths), batch_size)]
+    with ThreadPoolExecutor(io_workers) as reader, ThreadPoolExecutor(
+        io_workers
+    ) as writer:
+        writes = []
+        next_audios = reader.map(load, batches[0]) if batches else None
+        for i, batch_paths in enumerate(tqdm(batches, desc="Converting")):
+            audios = list(next_audios)
+            if i + 1 < len(batches):
+                next_audios = reader.map(load, batches[i + 1])
+            decoded = [(p, a) for p, a in zip(batch_paths, audios) if a is not None]
+            if not decoded:
+                continue
+            specs = audio_batch_to_spectrograms(
+                [audio for _, audio in decoded],
+                mel,
+                hop_length=hop_length,
+                normalize=True,
+            )
+            for write in writes:
+                write.result()
+            writes = [
+                writer.submit(save, split_spectrogram(spec, chunk_size, truncate), path)
+                for (path, _), spec in zip(decoded, specs)
+            ]
+        for write in writes:
+            write.result()
+
+
+def _save_numpy_chunks(chunks, path, inp, out_dir, dtype, archive):
+    output = get_numpy_output_path(path, out_dir, inp)
+    save_arrays(chunks, output, dtype=dtype, archive=archive)
+
+
+def _save_image_chunks(chunks, path, inp, out_dir, flip):
+    output = get_image_output_path(path, out_dir, inp)
+    save_images(chunks, output, flip=flip)
+
+
+def _audio_file_to_numpy(path, inp, out_dir, dtype, archive, **kwargs):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    chunks = _audio_to_chunks(path, **kwargs)
+    if chunks is not None:
+        _save_numpy_chunks(chunks, path, inp, out_dir, dtype, archive)
+
+
+def _audio_file_to_image(path, inp, out_dir, flip, **kwargs):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    chunks = _audio_to_chunks(path, **kwargs)
+    if chunks is not None:
+        _save_image_chunks(chunks, path, inp, out_dir, flip)
+
+
+def _image_dir_to_numpy(path, inp, out_dir, flip, dtype, archive):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    chunks = load_images(path, flip=flip)
+    output = get_numpy_output_path(path, out_dir, inp)
+    save_arrays(chunks, output, dtype=dtype, archive=archive)
+
+
+def _numpy_file_to_image(path, inp, out_dir, flip):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    chunks = iter_arrays(path)
+    output = get_image_output_path(path, out_dir, inp)
+    save_images(chunks, output, flip=flip)
+
+
+def _save_audio(spec, path, inp, out_dir, sr, n_fft, hop_length, fmt, backend):
+    to_audio = (
+        spectrogram_to_audio_on_gpu if backend == "torchaudio" else spectrogram_to_audio
+    )
+    audio = to_audio(spec, sr=sr, n_fft=n_fft, hop_length=hop_length, denormalize=True)
+    output = get_audio_output_path(path, out_dir, inp, fmt)
+    sf.write(output, audio, sr)
+
+
+def _numpy_file_to_audio(path, inp, out_dir, **kwargs):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    spec = load_arrays(path, join=True)
+    _save_audio(spec, path, inp, out_dir, **kwargs)
+
+
+def _image_dir_to_audio(path, inp, out_dir, flip, **kwargs):
+    tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
+    spec = load_images(path, flip=flip, join=True)
+    _save_audio(spec, path, inp, out_dir, **kwargs)
+
+
+def _spectrograms_to_audio(convert, paths, backend):
+    """
+    Run `convert` over `paths`, on the GPU in this process for the `torchaudio` backend,
+    or in a pool of worker processes otherwise.
+    """
+    if backend == "torchaudio":
+        for path in tqdm(paths, desc="Converting"):
+            convert(path)
+    elif backend == "librosa":
+        _process_map(convert, paths)
+    else:
+        raise ValueError(f"Unknown Griffin-Lim backend '{backend}'")
+
+
 def convert_audio_to_numpy(
     inp,
     out_dir,
@@ -314,46 +1151,66 @@ def convert_audio_to_numpy(
     n_mels=settings.N_MELS,
     chunk_size=settings.CHUNK_SIZE,
     truncate=settings.TRUNCATE,
+    backend=settings.SPECTROGRAM_BACKEND,
+    dtype=settings.CHUNK_DTYPE,
+    archive=settings.ARCHIVE_FORMAT,
+    paths=None,
     skip=0,
 ):
-    paths = get_paths(inp, parents=False)
+    paths = get_paths(inp, parents=False, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to Numpy arrays...")
     print(f"Arrays will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        try:
-            audio, sr = librosa.load(
-                str(path), sr=sr, offset=offset, duration=duration, res_type=res_type
-            )
-        except DecodeError as e:
-            print(f"Error decoding {path}: {e}")
-            continue
-        spec = audio_to_spectrogram(
-            audio,
-            sr=sr,
-            n_fft=n_fft,
-            hop_length=hop_length,
-            n_mels=n_mels,
-            normalize=True,
+    audio_kwargs = dict(
+        sr=sr,
+        offset=offset,
+        duration=duration,
+        res_type=res_type,
+        n_fft=n_fft,
+        hop_length=hop_length,
+        n_mels=n_mels,
+        chunk_size=chunk_size,
+        truncate=truncate,
+    )
+    if backend == "nnaudio":
+        save = partial(
+            _save_numpy_chunks, inp=inp, out_dir=out_dir, dtype=dtype, archive=archive
+        )
+        _audio_to_chunks_on_gpu(paths, save, **audio_kwargs)
+    elif backend == "librosa":
+        convert = partial(
+            _audio_file_to_numpy,
+            inp=inp,
+            out_dir=out_dir,
+            dtype=dtype,
+            archive=archive,
+            **audio_kwargs,
         )
-        chunks = split_spectrogram(spec, chunk_size, truncate=truncate)
-        output = get_numpy_output_path(path, out_dir, inp)
-        save_arrays(chunks, output)
+        _process_map(convert, paths, initargs=(sr, n_fft, n_mels))
+    else:
+        raise ValueError(f"Unknown spectrogram backend '{backend}'")
 
 
-def convert_image_to_numpy(inp, out_dir, flip=settings.IMAGE_FLIP, skip=0):
-    paths = get_paths(inp, parents=True)
+def convert_image_to_numpy(
+    inp,
+    out_dir,
+    flip=settings.IMAGE_FLIP,
+    dtype=settings.CHUNK_DTYPE,
+    archive=settings.ARCHIVE_FORMAT,
+    paths=None,
+    skip=0,
+):
+    paths = get_paths(inp, parents=True, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to Numpy arrays...")
     print(f"Arrays will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        chunks = load_images(path, flip=flip)
-        output = get_numpy_output_path(path, out_dir, inp)
-        save_arrays(chunks, output)
+    convert = partial(
+        _image_dir_to_numpy,
+        inp=inp,
+        out_dir=out_dir,
+        flip=flip,
+        dtype=dtype,
+        archive=archive,
+    )
+    _process_map(convert, paths)
 
 
 def convert_audio_to_image(
@@ -369,46 +1226,42 @@ def convert_audio_to_image(
     chunk_size=settings.CHUNK_SIZE,
     truncate=settings.TRUNCATE,
     flip=settings.IMAGE_FLIP,
+    backend=settings.SPECTROGRAM_BACKEND,
+    paths=None,
     skip=0,
 ):
-    paths = get_paths(inp, parents=False)
+    paths = get_paths(inp, parents=False, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to images...")
     print(f"Images will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        try:
-            audio, sr = librosa.load(
-                str(path), sr=sr, offset=offset, duration=duration, res_type=res_type
-            )
-        except DecodeError as e:
-            print(f"Error decoding {path}: {e}")
-            continue
-        spec = audio_to_spectrogram(
-            audio,
-            sr=sr,
-            n_fft=n_fft,
-            hop_length=hop_length,
-            n_mels=n_mels,
-            normalize=True,
+    audio_kwargs = dict(
+        sr=sr,
+        offset=offset,
+        duration=duration,
+        res_type=res_type,
+        n_fft=n_fft,
+        hop_length=hop_length,
+        n_mels=n_mels,
+        chunk_size=chunk_size,
+        truncate=truncate,
+    )
+    if backend == "nnaudio":
+        save = partial(_save_image_chunks, inp=inp, out_dir=out_dir, flip=flip)
+        _audio_to_chunks_on_gpu(paths, save, **audio_kwargs)
+    elif backend == "librosa":
+        convert = partial(
+            _audio_file_to_image, inp=inp, out_dir=out_dir, flip=flip, **audio_kwargs
         )
-        chunks = split_spectrogram(spec, chunk_size, truncate=truncate)
-        output = get_image_output_path(path, out_dir, inp)
-        save_images(chunks, output, flip=flip)
+        _process_map(convert, paths, initargs=(sr, n_fft, n_mels))
+    else:
+        raise ValueError(f"Unknown spectrogram backend '{backend}'")
 
 
-def convert_numpy_to_image(inp, out_dir, flip=settings.IMAGE_FLIP, skip=0):
-    paths = get_paths(inp, parents=False)
+def convert_numpy_to_image(inp, out_dir, flip=settings.IMAGE_FLIP, paths=None, skip=0):
+    paths = get_paths(inp, parents=False, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to images...")
     print(f"Images will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        chunks = load_arrays(path)
-        output = get_image_output_path(path, out_dir, inp)
-        save_images(chunks, output, flip=flip)
+    convert = partial(_numpy_file_to_image, inp=inp, out_dir=out_dir, flip=flip)
+    _process_map(convert, paths)
 
 
 def convert_numpy_to_audio(
@@ -420,21 +1273,24 @@ def convert_numpy_to_audio(
     fmt=settings.AUDIO_FORMAT,
     offset=settings.AUDIO_OFFSET,
     duration=settings.AUDIO_DURATION,
+    backend=settings.GRIFFINLIM_BACKEND,
+    paths=None,
     skip=0,
 ):
-    paths = get_paths(inp, parents=False)
+    paths = get_paths(inp, parents=False, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to audio...")
     print(f"Images will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        spec = load_arrays(path, join=True)
-        audio = spectrogram_to_audio(
-            spec, sr=sr, n_fft=n_fft, hop_length=hop_length, denormalize=True,
-        )
-        output = get_audio_output_path(path, out_dir, inp, fmt)
-        sf.write(output, audio, sr)
+    convert = partial(
+        _numpy_file_to_audio,
+        inp=inp,
+        out_dir=out_dir,
+        sr=sr,
+        n_fft=n_fft,
+        hop_length=hop_length,
+        fmt=fmt,
+        backend=backend,
+    )
+    _spectrograms_to_audio(convert, paths, backend)
 
 
 def convert_image_to_audio(
@@ -447,21 +1303,25 @@ def convert_image_to_audio(
     offset=settings.AUDIO_OFFSET,
     duration=settings.AUDIO_DURATION,
     flip=settings.IMAGE_FLIP,
+    backend=settings.GRIFFINLIM_BACKEND,
+    paths=None,
     skip=0,
 ):
-    paths = get_paths(inp, parents=True)
+    paths = get_paths(inp, parents=True, files=paths)[skip:]
     print(f"Converting files in {Fore.YELLOW}'{inp}'{Fore.RESET} to audio...")
     print(f"Images will be saved in {Fore.YELLOW}'{out_dir}'{Fore.RESET}\n")
-    for i, path in enumerate(tqdm(paths, desc="Converting")):
-        if i < skip:
-            continue
-        tqdm.write(f"Converting {Fore.YELLOW}'{path}'{Fore.RESET}...")
-        spec = load_images(path, flip=flip, join=True)
-        audio = spectrogram_to_audio(
-            spec, sr=sr, n_fft=n_fft, hop_length=hop_length, denormalize=True,
-        )
-        output = get_audio_output_path(path, out_dir, inp, fmt)
-        sf.write(output, audio, sr)
+    convert = partial(
+        _image_dir_to_audio,
+        inp=inp,
+        out_dir=out_dir,
+        sr=sr,
+        n_fft=n_fft,
+        hop_length=hop_length,
+        fmt=fmt,
+        flip=flip,
+        backend=backend,
+    )
+    _spectrograms_to_audio(convert, paths, backend)
 
 
 # endregion
@@ -480,10 +1340,17 @@ def convert_to_numpy(
     chunk_size=settings.CHUNK_SIZE,
     truncate=settings.TRUNCATE,
     flip=settings.IMAGE_FLIP,
+    backend=settings.SPECTROGRAM_BACKEND,
+    dtype=settings.CHUNK_DTYPE,
+    archive=settings.ARCHIVE_FORMAT,
     skip=0,
 ):
-    dtype = get_data_type(inp, raise_exception=True)
-    if dtype == DataType.AUDIO:
+    """
+    Convert the audio files or image directories under `inp` to spectrogram arrays in `out_dir`.
+    Files are converted in worker processes, so scripts must call this under an `if __name__ == "__main__":` guard.
+    """
+    data_type, paths = get_data_type(inp, raise_exception=True)
+    if data_type == DataType.AUDIO:
         return convert_audio_to_numpy(
             inp,
             out_dir,
@@ -496,10 +1363,22 @@ def convert_to_numpy(
             n_mels=n_mels,
             chunk_size=chunk_size,
             truncate=truncate,
+            backend=backend,
+            dtype=dtype,
+            archive=archive,
+            paths=paths,
+            skip=skip,
+        )
+    elif data_type == DataType.IMAGE:
+        return convert_image_to_numpy(
+            inp,
+            out_dir,
+            flip=flip,
+            dtype=dtype,
+            archive=archive,
+            paths=paths,
             skip=skip,
         )
-    elif dtype == DataType.IMAGE:
-        return convert_image_to_numpy(inp, out_dir, flip=flip, skip=skip)
 
 
 def convert_to_image(
@@ -514,9 +1393,14 @@ def convert_to_image(
     chunk_size=settings.CHUNK_SIZE,
     truncate=settings.TRUNCATE,
     flip=settings.IMAGE_FLIP,
+    backend=settings.SPECTROGRAM_BACKEND,
     skip=0,
 ):
-    dtype = get_data_type(inp, raise_exception=True)
+    """
+    Convert the audio files or arrays under `inp` to spectrogram images in `out_dir`.
+    Like `convert_to_numpy()`, scripts must call this under an `if __name__ == "__main__":` guard.
+    """
+    dtype, paths = get_data_type(inp, raise_exception=True)
     if dtype == DataType.AUDIO:
         return convert_audio_to_image(
             inp,
@@ -530,10 +1414,12 @@ def convert_to_image(
             chunk_size=chunk_size,
             truncate=truncate,
             flip=flip,
+            backend=backend,
+            paths=paths,
             skip=skip,
         )
     elif dtype == DataType.NUMPY:
-        return convert_numpy_to_image(inp, out_dir, flip=flip, skip=skip)
+        return convert_numpy_to_image(inp, out_dir, flip=flip, paths=paths, skip=skip)
 
 
 def convert_to_audio(
@@ -546,9 +1432,14 @@ def convert_to_audio(
     offset=settings.AUDIO_OFFSET,
     duration=settings.AUDIO_DURATION,
     flip=settings.IMAGE_FLIP,
+    backend=settings.GRIFFINLIM_BACKEND,
     skip=0,
 ):
-    dtype = get_data_type(inp, raise_exception=True)
+    """
+    Reconstruct audio from the arrays or image directories under `inp`, saving it to `out_dir`.
+    The `librosa` backend runs in worker processes, so scripts must call this under an `if __name__ == "__main__":` guard.
+    """
+    dtype, paths = get_data_type(inp, raise_exception=True)
     if dtype == DataType.NUMPY:
         return convert_numpy_to_audio(
             inp,
@@ -559,6 +1450,8 @@ def convert_to_audio(
             fmt=fmt,
             offset=offset,
             duration=duration,
+            backend=backend,
+            paths=paths,
             skip=skip,
         )
     elif dtype == DataType.IMAGE:
@@ -572,6 +1465,8 @@ def convert_to_audio(
             offset=offset,
             duration=duration,
             flip=flip,
+            backend=backend,
+            paths=paths,
             skip=skip,
         )
 
@@ -10,17 +10,22 @@ requirements = [
     "joblib",
     "click",
     "numpy",
+    "scipy",
     "Pillow",
+    "tifffile",
     "natsort",
     "ffmpeg",
     "librosa",
+    "numba",
     "soundfile",
+    "soxr",
     "pydot",
     "pydotplus",
     "graphviz",
     "python-dotenv",
     "requests",
     "mutagen",
+    "threadpoolctl",
 ]
 
 dev_requirements = [
@@ -30,6 +35,12 @@ dev_requirements = [
     "pre-commit",
 ]
 
+gpu_requirements = [
+    "torch",
+    "torchaudio",
+    "nnAudio",
+]
+
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
@@ -46,5 +57,9 @@ setuptools.setup(
     ],
     python_requires=">=3.7",
     install_requires=requirements,
-    extras_require={"dev": dev_requirements,},
+    extras_require={
+        "dev": dev_requirements,
+        "gpu": gpu_requirements,
+        "zstd": ["zstandard"],
+    },
 )